@@ -1,12 +1,15 @@
 # coding:utf-8
 
 from os.path import exists
+from typing import Iterable
+from typing import List
 from typing import Optional
 from typing import Union
 
 from docker import DockerClient
 from podman import PodmanClient
 
+from ckits_images.planner import TransferPlan
 from ckits_images.tags import TAG
 from ckits_images.tags import Tag
 
@@ -46,6 +49,10 @@ class UnifiedClient:
     def pull_all_tags(self, tag: TAG):
         return self.client.images.pull(Tag.parse(tag).name, all_tags=True)
 
+    def pull_tags(self, tags: Iterable[TAG]) -> List:
+        """Pull only the given tags, e.g. the Tags selected by Registry"""
+        return [self.pull(tag) for tag in tags]
+
     def push(self, tag: TAG):
         self.client.images.push(Tag.parse(tag).name)
 
@@ -58,6 +65,23 @@ class UnifiedClient:
         self.push(dst)
         return True
 
+    def execute(self, plan: TransferPlan) -> bool:
+        """Run the transport steps of a plan in order
+
+        A step with a digest pulls the planned manifest by digest, not the
+        platform of this host or whatever the tag points to by now.
+        """
+        for step in plan.transports:
+            src: Tag = step.src
+            if step.digest is not None:
+                src = Tag(repository=src.repository,
+                          registry_host=src.registry_host,
+                          namespace=src.namespace,
+                          digest=step.digest)
+            if not self.transport(src, step.dst):
+                return False
+        return True
+
     @classmethod
     def create_docker(cls) -> "UnifiedClient":
         assert exists(cls.DOCKER), "Docker socket not found"
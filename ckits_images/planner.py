@@ -0,0 +1,397 @@
+# coding:utf-8
+
+import json
+import os
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from ckits_images.registry import Registry
+from ckits_images.tags import TAG
+from ckits_images.tags import Tag
+from ckits_images.tags import Tags
+
+BLOB = Tuple[str, int]  # digest and size
+DESTINATION = Union[str, Iterable[str]]
+
+
+class Image:
+    """Resolved source image, the manifest of one platform and its blobs"""
+
+    def __init__(self, tag: Tag, digest: str, blobs: Iterable[BLOB],
+                 index_digest: Optional[str] = None):
+        self.__tag: Tag = tag
+        self.__digest: str = digest
+        self.__index_digest: Optional[str] = index_digest
+        # A registry stores a blob once, even if a manifest repeats a layer
+        unique: Dict[str, BLOB] = {}
+        for blob in blobs:
+            unique.setdefault(blob[0], blob)
+        self.__blobs: Tuple[BLOB, ...] = tuple(unique.values())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.tag}) digest: {self.digest}, "\
+            f"blobs: {len(self.blobs)}, size: {self.size}"
+
+    @property
+    def tag(self) -> Tag:
+        return self.__tag
+
+    @property
+    def digest(self) -> str:
+        return self.__digest
+
+    @property
+    def index_digest(self) -> Optional[str]:
+        """digest of the index (manifest list) the manifest was chosen from"""
+        return self.__index_digest
+
+    @property
+    def digests(self) -> Tuple[str, ...]:
+        """digests that identify this image in a registry"""
+        if self.index_digest is None:
+            return (self.digest,)
+        return (self.digest, self.index_digest)
+
+    @property
+    def blobs(self) -> Tuple[BLOB, ...]:
+        """config and layers, unique by digest"""
+        return self.__blobs
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size in self.blobs)
+
+
+class TransferStep:  # pylint:disable=R0902
+    """Transport one source tag to one destination tag"""
+    TRANSPORT: str = "transport"
+    SKIP: str = "skip"
+
+    def __init__(self, src: TAG, dst: TAG,  # pylint:disable=R0913,R0917
+                 action: str = TRANSPORT,
+                 digest: Optional[str] = None,
+                 pull_blobs: Iterable[str] = (),
+                 push_blobs: Iterable[str] = (),
+                 pull_bytes: int = 0, push_bytes: int = 0):
+        if action not in (self.TRANSPORT, self.SKIP):
+            raise ValueError(f"Invalid action: '{action}'")
+        self.__src: Tag = Tag.parse(src)
+        self.__dst: Tag = Tag.parse(dst)
+        self.__action: str = action
+        self.__digest: Optional[str] = digest
+        self.__pull_blobs: Tuple[str, ...] = tuple(pull_blobs)
+        self.__push_blobs: Tuple[str, ...] = tuple(push_blobs)
+        self.__pull_bytes: int = pull_bytes
+        self.__push_bytes: int = push_bytes
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.action}) "\
+            f"src: {self.src}, dst: {self.dst}, "\
+            f"pull: {self.pull_bytes}, push: {self.push_bytes}"
+
+    @property
+    def src(self) -> Tag:
+        return self.__src
+
+    @property
+    def dst(self) -> Tag:
+        return self.__dst
+
+    @property
+    def action(self) -> str:
+        return self.__action
+
+    @property
+    def digest(self) -> Optional[str]:
+        return self.__digest
+
+    @property
+    def pull_blobs(self) -> Tuple[str, ...]:
+        """blobs first pulled by this step"""
+        return self.__pull_blobs
+
+    @property
+    def push_blobs(self) -> Tuple[str, ...]:
+        """blobs first pushed by this step"""
+        return self.__push_blobs
+
+    @property
+    def pull_bytes(self) -> int:
+        return self.__pull_bytes
+
+    @property
+    def push_bytes(self) -> int:
+        return self.__push_bytes
+
+    @property
+    def transfer_bytes(self) -> int:
+        return self.pull_bytes + self.push_bytes
+
+    def dump(self) -> Dict[str, Any]:
+        return {"src": self.src.name, "dst": self.dst.name,
+                "action": self.action, "digest": self.digest,
+                "pull_blobs": list(self.pull_blobs),
+                "push_blobs": list(self.push_blobs),
+                "pull_bytes": self.pull_bytes,
+                "push_bytes": self.push_bytes}
+
+    @classmethod
+    def load(cls, data: Dict[str, Any]) -> "TransferStep":
+        return cls(src=data["src"], dst=data["dst"],
+                   action=data.get("action", cls.TRANSPORT),
+                   digest=data.get("digest"),
+                   pull_blobs=data.get("pull_blobs", ()),
+                   push_blobs=data.get("push_blobs", ()),
+                   pull_bytes=data.get("pull_bytes", 0),
+                   push_bytes=data.get("push_bytes", 0))
+
+
+class TransferPlan:
+    """Ordered transfer steps with their estimated cost
+
+    The plan file is a json document that UnifiedClient.execute runs
+    directly, steps are transported in order and skipped steps ignored.
+    """
+    VERSION: int = 1
+
+    def __init__(self, steps: Iterable[TransferStep] = (),
+                 bandwidth: float = 0.0):
+        self.__steps: List[TransferStep] = list(steps)
+        self.__bandwidth: float = bandwidth
+
+    def __iter__(self) -> Iterator[TransferStep]:
+        return iter(self.__steps)
+
+    def __len__(self) -> int:
+        return len(self.__steps)
+
+    @property
+    def steps(self) -> Tuple[TransferStep, ...]:
+        return tuple(self.__steps)
+
+    @property
+    def transports(self) -> Tuple[TransferStep, ...]:
+        return tuple(step for step in self if step.action == TransferStep.TRANSPORT)  # noqa: E501
+
+    @property
+    def bandwidth(self) -> float:
+        """bytes per second used to estimate the time"""
+        return self.__bandwidth
+
+    @property
+    def pull_bytes(self) -> int:
+        return sum(step.pull_bytes for step in self)
+
+    @property
+    def push_bytes(self) -> int:
+        return sum(step.push_bytes for step in self)
+
+    @property
+    def transfer_bytes(self) -> int:
+        return self.pull_bytes + self.push_bytes
+
+    @property
+    def estimated_seconds(self) -> float:
+        return self.estimate(self.transfer_bytes)
+
+    def estimate(self, nbytes: int) -> float:
+        return nbytes / self.bandwidth if self.bandwidth > 0 else 0.0
+
+    def append(self, step: TransferStep):
+        self.__steps.append(step)
+
+    def dump(self) -> Dict[str, Any]:
+        steps: List[Dict[str, Any]] = []
+        for step in self:
+            data: Dict[str, Any] = step.dump()
+            data["estimated_seconds"] = self.estimate(step.transfer_bytes)
+            steps.append(data)
+        return {"version": self.VERSION, "bandwidth": self.bandwidth,
+                "pull_bytes": self.pull_bytes, "push_bytes": self.push_bytes,
+                "estimated_seconds": self.estimated_seconds, "steps": steps}
+
+    def save(self, filename: str):
+        with open(filename, "w", encoding="utf-8") as whdl:
+            json.dump(self.dump(), whdl, indent=2)
+
+    @classmethod
+    def load(cls, data: Dict[str, Any]) -> "TransferPlan":
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported plan version: '{data.get('version')}'")  # noqa: E501
+        return cls(steps=[TransferStep.load(step) for step in data["steps"]],
+                   bandwidth=data.get("bandwidth", 0.0))
+
+    @classmethod
+    def open(cls, filename: str) -> "TransferPlan":
+        if not os.path.isfile(filename):
+            raise FileNotFoundError(f"Plan file not found: '{filename}'")
+        with open(filename, "r", encoding="utf-8") as rhdl:
+            return cls.load(json.load(rhdl))
+
+
+class TransferPlanner:
+    """Plan a transfer without pulling anything
+
+    destinations maps a source prefix ('registry_host[/namespace[/repo]]')
+    to one or more destination prefixes, the longest matching prefix wins.
+    The mapped name must keep exactly registry_host/namespace/repository,
+    sources pinned by digest cannot be mapped to a destination tag:
+
+        {"docker.io": "registry.example.com",
+         "docker.io/library": ["mirror-a.example.com/library",
+                               "mirror-b.example.com/docker"]}
+
+    Source manifests are resolved through the registry, a manifest list is
+    resolved to the manifest of platform. Every blob is counted once for
+    pulling and once per destination registry host for pushing, blobs that
+    the destination repository already has are not pushed again.
+    """
+    PLATFORM: str = "linux/amd64"
+    BANDWIDTH: float = 100 * 1000 * 1000 / 8  # 100 Mbit/s
+    INDEX_TYPES: Tuple[str, ...] = (
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+    )
+
+    def __init__(self, destinations: Dict[str, DESTINATION],
+                 registry: Optional[Registry] = None,
+                 platform: str = PLATFORM,
+                 bandwidth: float = BANDWIDTH):
+        self.__destinations: Dict[str, Tuple[str, ...]] = {
+            prefix.strip("/"): (dst,) if isinstance(dst, str) else tuple(dst)
+            for prefix, dst in destinations.items()}
+        self.__registry: Registry = registry or Registry()
+        self.__platform: str = platform
+        self.__bandwidth: float = bandwidth
+        self.__images: Dict[str, Image] = {}
+
+    @property
+    def registry(self) -> Registry:
+        return self.__registry
+
+    @property
+    def platform(self) -> str:
+        return self.__platform
+
+    @property
+    def bandwidth(self) -> float:
+        return self.__bandwidth
+
+    def destination_tags(self, tag: TAG) -> Tags:
+        src: Tag = Tag.parse(tag)
+        if src.digest is not None:
+            # Tag.tag would be 'latest' and overwrite the mirror's latest
+            raise ValueError(f"Cannot map a digest reference: '{src.name}'")  # noqa: E501
+        name: str = src.name_without_tag
+        prefixes: List[str] = [prefix for prefix in self.__destinations
+                               if name == prefix or name.startswith(f"{prefix}/")]  # noqa: E501
+        if len(prefixes) == 0:
+            raise ValueError(f"No destination for: '{src.name}'")
+        prefix: str = max(prefixes, key=len)
+        tags: Tags = Tags()
+        for dst in self.__destinations[prefix]:
+            dst_name: str = f"{dst.strip('/')}{name[len(prefix):]}"
+            if len(dst_name.split("/")) != 3:
+                raise ValueError(f"Invalid destination '{dst}' for '{src.name}', "  # noqa: E501
+                                 f"expected registry_host/namespace/repository: '{dst_name}'")  # noqa: E501
+            tags.append(Tag.parse_long_name(f"{dst_name}:{src.tag}"))
+        return tags
+
+    def match_platform(self, platform: Dict[str, str]) -> bool:
+        parts: List[str] = self.platform.split("/")
+        values: List[str] = [platform.get("os", ""),
+                             platform.get("architecture", ""),
+                             platform.get("variant", "")]
+        return parts == values[:len(parts)]
+
+    def resolve(self, tag: TAG) -> Image:
+        """Resolve the manifest of tag, results are kept for the planner"""
+        src: Tag = Tag.parse(tag)
+        if src.name in self.__images:
+            return self.__images[src.name]
+
+        manifest, digest = self.registry.manifest(src)
+        index_digest: Optional[str] = None
+        if manifest.get("mediaType") in self.INDEX_TYPES or "manifests" in manifest:  # noqa: E501
+            index_digest = digest
+            descriptors = [descriptor for descriptor in manifest["manifests"]
+                           if self.match_platform(descriptor.get("platform", {}))]  # noqa: E501
+            if len(descriptors) == 0:
+                raise ValueError(f"No '{self.platform}' manifest for: '{src.name}'")  # noqa: E501
+            digest = descriptors[0]["digest"]
+            manifest, _ = self.registry.manifest(src, digest)
+
+        if "config" not in manifest or "layers" not in manifest:
+            raise ValueError(f"Unsupported manifest for: '{src.name}'")
+
+        blobs: List[BLOB] = [(manifest["config"]["digest"], manifest["config"]["size"])]  # noqa: E501
+        blobs.extend((layer["digest"], layer["size"]) for layer in manifest["layers"])  # noqa: E501
+        image: Image = Image(tag=src, digest=digest, blobs=blobs,
+                             index_digest=index_digest)
+        self.__images[src.name] = image
+        return image
+
+    def plan(self, tags: Iterable[TAG]) -> TransferPlan:  # pylint:disable=R0914
+        """Plan the transfer of tags, extra tags are included"""
+        sources: Tags = Tags()
+        for tag in tags:
+            src: Tag = Tag.parse(tag)
+            sources.append(src)
+            sources.extend(src.extra_tags)
+
+        pairs: List[Tuple[Image, Tag]] = []
+        skipped: List[TransferStep] = []
+        for src in sources:
+            destinations: Tags = self.destination_tags(src)
+            image: Image = self.resolve(src)
+            for dst in destinations:
+                if self.registry.manifest_digest(dst) in image.digests:
+                    skipped.append(TransferStep(src, dst, TransferStep.SKIP, image.digest))  # noqa: E501
+                else:
+                    pairs.append((image, dst))
+
+        plan: TransferPlan = TransferPlan(bandwidth=self.bandwidth)
+        pulled: Set[str] = set()
+        pushed: Dict[str, Set[str]] = {}
+        for image, dst in self.order(pairs):
+            pull_blobs: List[BLOB] = [blob for blob in image.blobs if blob[0] not in pulled]  # noqa: E501
+            pulled.update(digest for digest, _ in pull_blobs)
+            host_blobs: Set[str] = pushed.setdefault(dst.registry_host, set())  # noqa: E501
+            push_blobs: List[BLOB] = [blob for blob in image.blobs
+                                      if blob[0] not in host_blobs
+                                      and not self.registry.blob_exists(dst, blob[0])]  # noqa: E501
+            host_blobs.update(digest for digest, _ in image.blobs)
+            plan.append(TransferStep(
+                src=image.tag, dst=dst, digest=image.digest,
+                pull_blobs=[digest for digest, _ in pull_blobs],
+                push_blobs=[digest for digest, _ in push_blobs],
+                pull_bytes=sum(size for _, size in pull_blobs),
+                push_bytes=sum(size for _, size in push_blobs)))
+        for step in skipped:
+            plan.append(step)
+        return plan
+
+    @classmethod
+    def order(cls, pairs: List[Tuple[Image, Tag]]) -> List[Tuple[Image, Tag]]:  # noqa: E501
+        """Order images sharing the most bytes with other images first
+
+        Shared blobs (e.g. base layers) are then transferred by the first
+        steps, the relative order of the other images is kept.
+        """
+        owners: Dict[str, Set[str]] = {}
+        for image, _ in pairs:
+            for digest, _ in image.blobs:
+                owners.setdefault(digest, set()).add(image.digest)
+
+        def shared_bytes(pair: Tuple[Image, Tag]) -> int:
+            return sum(size for digest, size in pair[0].blobs
+                       if len(owners[digest]) > 1)
+
+        return sorted(pairs, key=lambda pair: -shared_bytes(pair))
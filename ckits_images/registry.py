@@ -0,0 +1,281 @@
+# coding:utf-8
+
+import json
+import os
+import re
+from hashlib import sha256
+from http.client import HTTPMessage
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.parse import urljoin
+from urllib.request import Request
+from urllib.request import urlopen
+
+from ckits_images.tags import TAG
+from ckits_images.tags import Tag
+from ckits_images.tags import TagFilter
+from ckits_images.tags import Tags
+
+
+class RegistryCache:
+    """On-disk cache of registry responses
+
+    Every entry is keyed by request url and keeps the response validators
+    (ETag and Last-Modified), so an unchanged response can be revalidated
+    with a conditional request instead of being transferred again.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if directory is None:
+            cache_home: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")  # noqa: E501
+            directory = os.path.join(cache_home, "ckits", "registry")
+        self.__directory: str = os.path.abspath(directory)
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def filename(self, url: str) -> str:
+        digest: str = sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        filename: str = self.filename(url)
+        if not os.path.isfile(filename):
+            return None
+        try:
+            with open(filename, "r", encoding="utf-8") as rhdl:
+                entry: Dict[str, Any] = json.load(rhdl)
+        except ValueError:
+            return None  # ignore corrupted entry
+        return entry if entry.get("url") == url else None
+
+    def save(self, url: str, headers: HTTPMessage, payload: Any,
+             digest: Optional[str] = None) -> Dict[str, Any]:
+        os.makedirs(self.directory, exist_ok=True)
+        entry: Dict[str, Any] = {"url": url,
+                                 "etag": headers.get("ETag"),
+                                 "last_modified": headers.get("Last-Modified"),  # noqa: E501
+                                 "link": headers.get("Link"),
+                                 "digest": digest,
+                                 "payload": payload}
+        filename: str = self.filename(url)
+        temporary: str = f"{filename}.tmp"
+        with open(temporary, "w", encoding="utf-8") as whdl:
+            json.dump(entry, whdl)
+        os.replace(temporary, filename)
+        return entry
+
+    @classmethod
+    def validators(cls, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Conditional request headers to revalidate a cache entry"""
+        headers: Dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+class Registry:
+    """Docker Registry HTTP API V2 client
+
+    Only read-only requests are implemented (tag listing, manifests and
+    blob existence), which allows selecting tags and planning transfers
+    before pulling anything.
+    """
+    DOCKER_HUB_HOST: str = "registry-1.docker.io"
+    PAGE_SIZE: int = 1000
+    MANIFEST_TYPES: Tuple[str, ...] = (
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.oci.image.manifest.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+        "application/vnd.docker.distribution.manifest.v2+json",
+    )
+
+    def __init__(self, cache: Optional[RegistryCache] = None,
+                 scheme: str = "https", timeout: float = 30.0,
+                 page_size: int = PAGE_SIZE):
+        self.__cache: RegistryCache = cache or RegistryCache()
+        self.__scheme: str = scheme
+        self.__timeout: float = timeout
+        self.__page_size: int = page_size
+        self.__tokens: Dict[str, str] = {}
+
+    @property
+    def cache(self) -> RegistryCache:
+        return self.__cache
+
+    @property
+    def scheme(self) -> str:
+        return self.__scheme
+
+    @property
+    def timeout(self) -> float:
+        return self.__timeout
+
+    @property
+    def page_size(self) -> int:
+        return self.__page_size
+
+    def endpoint(self, tag: TAG) -> str:
+        registry_host: str = Tag.parse(tag).registry_host
+        if registry_host == Tag.DEFAULT_REGISTRY_HOST:
+            registry_host = self.DOCKER_HUB_HOST
+        return f"{self.scheme}://{registry_host}"
+
+    def repository_url(self, tag: TAG) -> str:
+        _tag: Tag = Tag.parse(tag)
+        return f"{self.endpoint(_tag)}/v2/{_tag.namespace}/{_tag.repository}"  # noqa: E501
+
+    def tags_url(self, tag: TAG) -> str:
+        query: str = urlencode({"n": self.page_size})
+        return f"{self.repository_url(tag)}/tags/list?{query}"
+
+    def manifest_url(self, tag: TAG, reference: Optional[str] = None) -> str:
+        """reference defaults to the digest or tag of tag"""
+        _tag: Tag = Tag.parse(tag)
+        return f"{self.repository_url(_tag)}/manifests/{reference or _tag.digest or _tag.tag}"  # noqa: E501
+
+    def blob_url(self, tag: TAG, digest: str) -> str:
+        return f"{self.repository_url(tag)}/blobs/{digest}"
+
+    def list_tags(self, tag: TAG) -> List[str]:
+        """List all tag names of the repository of tag
+
+        Each page is revalidated against the cache, an unchanged page is
+        answered with '304 Not Modified' and read from the cache.
+        """
+        names: List[str] = []
+        url: Optional[str] = self.tags_url(tag)
+        while url is not None:
+            payload, entry = self.get_json(url)
+            names.extend(payload.get("tags") or [])
+            url = self.next_url(url, entry.get("link"))
+        return names
+
+    def select_tags(self, tag: TAG, glob: Optional[str] = None,  # pylint:disable=R0913,R0917
+                    regex: Optional[str] = None,
+                    semver: Optional[str] = None,
+                    include_prerelease: bool = False) -> Tags:
+        """Expand the repository of tag to the matching tags"""
+        tag_filter = TagFilter(glob=glob, regex=regex, semver=semver,
+                               include_prerelease=include_prerelease)
+        return tag_filter.select(tag, self.list_tags(tag))
+
+    def manifest(self, tag: TAG, reference: Optional[str] = None)\
+            -> Tuple[Dict[str, Any], str]:
+        """Get an image manifest or index, returns it with its digest
+
+        A tag is first resolved to its digest with a HEAD request, which
+        registries (e.g. Docker Hub) do not count as a pull. A manifest
+        referenced by digest never changes, so a cached one is returned
+        without any request.
+        """
+        _tag: Tag = Tag.parse(tag)
+        reference = reference or _tag.digest or self.manifest_digest(_tag)
+        payload, entry = self.get_json(self.manifest_url(_tag, reference),
+                                       ", ".join(self.MANIFEST_TYPES),
+                                       immutable=reference is not None and ":" in reference)  # noqa: E501
+        return payload, entry["digest"]
+
+    def manifest_digest(self, tag: TAG) -> Optional[str]:
+        """Digest of the manifest of tag, None if the tag does not exist"""
+        headers: Dict[str, str] = {"Accept": ", ".join(self.MANIFEST_TYPES)}
+        try:
+            _, response_headers, _ = self.request(self.manifest_url(tag), headers, "HEAD")  # noqa: E501
+        except HTTPError as error:
+            if error.code == 404:
+                return None
+            raise
+        return response_headers.get("Docker-Content-Digest")
+
+    def blob_exists(self, tag: TAG, digest: str) -> bool:
+        """Whether the repository of tag already has the blob"""
+        try:
+            self.request(self.blob_url(tag, digest), {}, "HEAD")
+        except HTTPError as error:
+            if error.code == 404:
+                return False
+            raise
+        return True
+
+    def get_json(self, url: str, accept: str = "application/json",
+                 immutable: bool = False) -> Tuple[Any, Dict[str, Any]]:
+        """GET a json document, returns the payload and its cache entry
+
+        An immutable (content addressed) document is not revalidated.
+        """
+        entry: Optional[Dict[str, Any]] = self.cache.load(url)
+        if immutable and entry is not None:
+            return entry["payload"], entry
+        headers: Dict[str, str] = {"Accept": accept}
+        headers.update(self.cache.validators(entry))
+        try:
+            _, response_headers, body = self.request(url, headers)
+        except HTTPError as error:
+            if error.code == 304 and entry is not None:
+                return entry["payload"], entry
+            raise
+        payload: Any = json.loads(body.decode("utf-8"))
+        digest: str = response_headers.get("Docker-Content-Digest") or f"sha256:{sha256(body).hexdigest()}"  # noqa: E501
+        return payload, self.cache.save(url, response_headers, payload, digest)  # noqa: E501
+
+    def request(self, url: str, headers: Dict[str, str],
+                method: str = "GET") -> Tuple[int, HTTPMessage, bytes]:
+        """Send a request, authenticating with a bearer token if the
+        registry challenges for one
+        """
+        scope: str = self.scope(url)
+        if scope in self.__tokens:
+            headers["Authorization"] = f"Bearer {self.__tokens[scope]}"
+        try:
+            return self.urlopen(url, headers, method)
+        except HTTPError as error:
+            challenge: str = error.headers.get("WWW-Authenticate", "")
+            if error.code != 401 or not challenge.startswith("Bearer "):
+                raise
+            self.__tokens[scope] = self.token(challenge)
+            headers["Authorization"] = f"Bearer {self.__tokens[scope]}"
+            return self.urlopen(url, headers, method)
+
+    def urlopen(self, url: str, headers: Dict[str, str],
+                method: str = "GET") -> Tuple[int, HTTPMessage, bytes]:
+        request = Request(url, headers=headers, method=method)
+        with urlopen(request, timeout=self.timeout) as response:  # nosec
+            return response.status, response.headers, response.read()
+
+    def token(self, challenge: str) -> str:
+        """Request an anonymous bearer token for a WWW-Authenticate challenge"""  # noqa: E501
+        params: Dict[str, str] = dict(re.findall(r'(\w+)="([^"]*)"', challenge))  # noqa: E501
+        if "realm" not in params:
+            raise ValueError(f"Invalid authenticate challenge: '{challenge}'")
+        realm: str = params.pop("realm")
+        url: str = f"{realm}?{urlencode(params)}" if params else realm
+        _, _, body = self.urlopen(url, {"Accept": "application/json"})
+        payload: Dict[str, Any] = json.loads(body.decode("utf-8"))
+        token: Optional[str] = payload.get("token") or payload.get("access_token")  # noqa: E501
+        if not token:
+            raise ValueError(f"No token returned by '{realm}'")
+        return token
+
+    @classmethod
+    def scope(cls, url: str) -> str:
+        """Repository part of an API url, used to reuse bearer tokens"""
+        matched = re.match(r"^(\w+://[^/]+/v2/.+?)/(?:tags|manifests|blobs)/", url)  # noqa: E501
+        return matched.group(1) if matched else url
+
+    @classmethod
+    def next_url(cls, url: str, link: Optional[str]) -> Optional[str]:
+        """Resolve the next page from a Link header: <url>; rel="next" """
+        if not link:
+            return None
+        matched = re.search(r'<([^>]+)>\s*;\s*rel="?next"?', link)
+        return urljoin(url, matched.group(1)) if matched else None
@@ -0,0 +1,261 @@
+# coding:utf-8
+
+import re
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+
+class Version:
+    """Semantic Version Format:
+
+    [v]major[.minor[.patch]][-prerelease][+build]
+    """
+    PATTERN = re.compile(r"^[vV]?(?P<major>0|[1-9]\d*)(?:\.(?P<minor>0|[1-9]\d*))?(?:\.(?P<patch>0|[1-9]\d*))?(?:-(?P<prerelease>[0-9A-Za-z.-]+))?(?:\+(?P<build>[0-9A-Za-z.-]+))?$")  # noqa: E501
+
+    def __init__(self, major: int, minor: int = 0, patch: int = 0,
+                 prerelease: Optional[str] = None):
+        self.__major: int = major
+        self.__minor: int = minor
+        self.__patch: int = patch
+        self.__prerelease: Optional[str] = prerelease
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self})"
+
+    def __str__(self) -> str:
+        version: str = f"{self.major}.{self.minor}.{self.patch}"
+        return version if self.prerelease is None else f"{version}-{self.prerelease}"  # noqa: E501
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Version) and self.key == other.key
+
+    def __lt__(self, other: "Version") -> bool:
+        return self.key < other.key
+
+    def __le__(self, other: "Version") -> bool:
+        return self.key <= other.key
+
+    def __gt__(self, other: "Version") -> bool:
+        return self.key > other.key
+
+    def __ge__(self, other: "Version") -> bool:
+        return self.key >= other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    @property
+    def major(self) -> int:
+        return self.__major
+
+    @property
+    def minor(self) -> int:
+        return self.__minor
+
+    @property
+    def patch(self) -> int:
+        return self.__patch
+
+    @property
+    def prerelease(self) -> Optional[str]:
+        return self.__prerelease
+
+    @property
+    def key(self) -> Tuple:
+        """precedence key, a prerelease sorts before its release"""
+        if self.prerelease is None:
+            return (self.major, self.minor, self.patch, 1, ())
+        identifiers = tuple((0, int(i), "") if i.isdigit() else (1, 0, i)
+                            for i in self.prerelease.split("."))
+        return (self.major, self.minor, self.patch, 0, identifiers)
+
+    @classmethod
+    def match(cls, text: str) -> Optional["re.Match"]:
+        return cls.PATTERN.match(text.strip())
+
+    @classmethod
+    def parse(cls, text: str) -> "Version":
+        if (matched := cls.match(text)) is None:
+            raise ValueError(f"Invalid version: '{text}'")
+        return cls(major=int(matched.group("major")),
+                   minor=int(matched.group("minor") or 0),
+                   patch=int(matched.group("patch") or 0),
+                   prerelease=matched.group("prerelease"))
+
+    @classmethod
+    def try_parse(cls, text: str) -> Optional["Version"]:
+        try:
+            return cls.parse(text)
+        except ValueError:
+            return None
+
+
+VERSION = Union[Version, str]
+
+
+class VersionRange:
+    """Semantic Version Range Format:
+
+    comparator set: <comparator>[[,| ]<comparator>[...]]
+    alternatives: <comparator set>[ || <comparator set>[...]]
+    comparator: [>|>=|<|<=|=|==|!=|^|~]<version> or <partial version>
+
+    A partial version (e.g. '2', '2.1', '2.x', '2.1.*') matches every
+    version with that prefix, '^' allows changes that do not modify the
+    left-most non-zero component and '~' allows patch-level changes.
+    '!=' only accepts a full version, a partial version is rejected.
+    Prerelease versions only match if include_prerelease is set.
+    """
+    OPERATORS: Tuple[str, ...] = (">=", "<=", "==", "!=", ">", "<", "=", "^", "~")  # noqa: E501
+    WILDCARDS: Tuple[str, ...] = ("*", "x", "X")
+
+    def __init__(self, text: str, include_prerelease: bool = False):
+        self.__text: str = text
+        self.__include_prerelease: bool = include_prerelease
+        self.__alternatives: List[List[Tuple[str, Version]]] = [
+            self.parse_comparator_set(alternative)
+            for alternative in text.split("||")]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.text})"
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __contains__(self, version: VERSION) -> bool:
+        return self.match(version)
+
+    @property
+    def text(self) -> str:
+        return self.__text
+
+    @property
+    def include_prerelease(self) -> bool:
+        return self.__include_prerelease
+
+    def match(self, version: VERSION) -> bool:
+        if isinstance(version, str):
+            if (_version := Version.try_parse(version)) is None:
+                return False
+            version = _version
+        if version.prerelease is not None and not self.include_prerelease:
+            return False
+        return any(all(self.compare(version, operator, bound)
+                       for operator, bound in comparators)
+                   for comparators in self.__alternatives)
+
+    @classmethod
+    def compare(cls, version: Version, operator: str, bound: Version) -> bool:  # noqa: E501 pylint:disable=R0911
+        if operator == ">=":
+            return version >= bound
+        if operator == "<=":
+            return version <= bound
+        if operator == ">":
+            return version > bound
+        if operator == "<":
+            if bound.prerelease is None:
+                # '<3.0.0' also excludes the prereleases of 3.0.0
+                return version.key[:3] < bound.key[:3]
+            return version < bound
+        if operator == "!=":
+            return version != bound
+        return version == bound
+
+    @classmethod
+    def parse_partial(cls, text: str) -> Tuple[int, ...]:
+        """Parse a partial version, returns the specified components"""
+        numbers: List[int] = []
+        wildcard: bool = False
+        for part in text.lstrip("vV").split("."):
+            if part in cls.WILDCARDS:
+                wildcard = True
+            elif wildcard or not part.isdigit():
+                # Only wildcards may follow a wildcard, e.g. '2.*.*'
+                raise ValueError(f"Invalid version range: '{text}'")
+            else:
+                numbers.append(int(part))
+        if len(numbers) > 3:
+            raise ValueError(f"Invalid version range: '{text}'")
+        return tuple(numbers)
+
+    @classmethod
+    def parse_comparator(cls, text: str) -> List[Tuple[str, Version]]:
+        operator: str = next((op for op in cls.OPERATORS if text.startswith(op)), "")  # noqa: E501
+        text = text[len(operator):].strip()
+
+        if "-" in text or "+" in text:
+            return cls.parse_prerelease_comparator(operator, text)
+
+        parts: Tuple[int, ...] = cls.parse_partial(text)
+        if operator == "!=" and len(parts) < 3:
+            # A comparator set cannot exclude a range, e.g. every 2.1.x
+            raise ValueError(f"Invalid version range, '!=' requires a full version: '{text}'")  # noqa: E501
+
+        if len(parts) == 0:
+            # Only wildcards, e.g. '*' or 'x.x'
+            return [(">=", Version(0))]
+        lower: Version = Version(parts[0], *parts[1:])
+
+        if operator in ("^", "~"):
+            return [(">=", lower), ("<", cls.upper_bound(operator, parts))]
+
+        if operator in ("", "=", "==", "<=", ">") and len(parts) < 3:
+            return cls.parse_partial_comparator(operator, parts)
+
+        return [(operator if operator not in ("", "==") else "=", lower)]
+
+    @classmethod
+    def parse_prerelease_comparator(cls, operator: str, text: str)\
+            -> List[Tuple[str, Version]]:
+        """Full version with prerelease or build metadata"""
+        version: Version = Version.parse(text)
+        if operator in ("^", "~"):
+            # Same upper bound as the release of this version
+            parts: Tuple[int, ...] = (version.major, version.minor, version.patch)  # noqa: E501
+            return [(">=", version), ("<", cls.upper_bound(operator, parts))]
+        return [(operator if operator not in ("", "==") else "=", version)]
+
+    @classmethod
+    def upper_bound(cls, operator: str, parts: Tuple[int, ...]) -> Version:
+        """Exclusive upper bound of '^' or '~'"""
+        if operator == "~":
+            return cls.next_partial(parts[:2])
+        if len(parts) == 3 and parts[0] == 0 and parts[1] == 0:
+            return Version(0, 0, parts[2] + 1)
+        if len(parts) >= 2 and parts[0] == 0:
+            return Version(0, parts[1] + 1)
+        return Version(parts[0] + 1)
+
+    @classmethod
+    def next_partial(cls, parts: Tuple[int, ...]) -> Version:
+        """First version after a partial version, e.g. '2.1' -> '2.2.0'"""
+        if len(parts) == 1:
+            return Version(parts[0] + 1)
+        return Version(parts[0], parts[1] + 1)
+
+    @classmethod
+    def parse_partial_comparator(cls, operator: str, parts: Tuple[int, ...])\
+            -> List[Tuple[str, Version]]:
+        """Widen a partial version to every version with that prefix"""
+        upper: Version = cls.next_partial(parts)
+        if operator == "<=":
+            # '<=2.1' includes every 2.1.x version
+            return [("<", upper)]
+        if operator == ">":
+            # '>2.1' excludes every 2.1.x version
+            return [(">=", upper)]
+        return [(">=", Version(parts[0], *parts[1:])), ("<", upper)]
+
+    @classmethod
+    def parse_comparator_set(cls, text: str) -> List[Tuple[str, Version]]:
+        # Allow whitespace between an operator and its version: '>= 2.0'
+        text = re.sub(r"(>=|<=|==|!=|>|<|=|\^|~)\s+", r"\1", text.strip())
+        tokens: List[str] = [token for token in re.split(r"[\s,]+", text) if token]  # noqa: E501
+        if len(tokens) == 0:
+            raise ValueError(f"Invalid version range: '{text}'")
+        comparators: List[Tuple[str, Version]] = []
+        for token in tokens:
+            comparators.extend(cls.parse_comparator(token))
+        return comparators
@@ -2,6 +2,7 @@
 
 import os
 import re
+from fnmatch import fnmatchcase
 from typing import Dict
 from typing import Iterable
 from typing import Iterator
@@ -10,6 +11,8 @@ from typing import Optional
 from typing import Tuple
 from typing import Union
 
+from ckits_images.semver import VersionRange
+
 
 class Tag:
     """Tag Format:
@@ -256,6 +259,61 @@ class Tags:
         return tuple(Tag.parse_long_name(name) for name in names)
 
 
+class TagFilter:
+    """Select tags by name
+
+    glob: shell-style wildcards, e.g. 'v2.*'
+    regex: regular expression that must match the whole tag
+    semver: semantic version range, e.g. '>=2.1,<3' or '^2.1'
+
+    A tag is selected only if it satisfies every given condition.
+    """
+
+    def __init__(self, glob: Optional[str] = None,
+                 regex: Optional[str] = None,
+                 semver: Optional[str] = None,
+                 include_prerelease: bool = False):
+        self.__glob: Optional[str] = glob
+        self.__regex: Optional["re.Pattern"] = re.compile(regex) if regex is not None else None  # noqa: E501
+        self.__semver: Optional[VersionRange] = VersionRange(semver, include_prerelease) if semver is not None else None  # noqa: E501
+
+    def __call__(self, tag: str) -> bool:
+        return self.match(tag)
+
+    @property
+    def glob(self) -> Optional[str]:
+        return self.__glob
+
+    @property
+    def regex(self) -> Optional["re.Pattern"]:
+        return self.__regex
+
+    @property
+    def semver(self) -> Optional[VersionRange]:
+        return self.__semver
+
+    def match(self, tag: str) -> bool:
+        if self.glob is not None and not fnmatchcase(tag, self.glob):
+            return False
+        if self.regex is not None and not self.regex.fullmatch(tag):
+            return False
+        if self.semver is not None and not self.semver.match(tag):
+            return False
+        return True
+
+    def select(self, tag: TAG, names: Iterable[str]) -> Tags:
+        """Expand the repository of tag to a Tags of the matching names"""
+        base: Tag = Tag.parse(tag)
+        tags: Tags = Tags()
+        for name in names:
+            if self.match(name):
+                tags.append(Tag(repository=base.repository,
+                                registry_host=base.registry_host,
+                                namespace=base.namespace,
+                                tag=name))
+        return tags
+
+
 class TagConfigFile(Tags):
     """Parser tag configuration file"""
 
@@ -0,0 +1,125 @@
+# coding:utf-8
+
+import json
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Thread
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+INDEX = "application/vnd.oci.image.index.v1+json"
+MANIFEST = "application/vnd.oci.image.manifest.v1+json"
+TOKEN = "unittest-token"
+
+
+def digest_of(name):
+    return f"sha256:{sha256(name.encode('utf-8')).hexdigest()}"
+
+
+class FakeRegistryHandler(BaseHTTPRequestHandler):
+    """Local stand-in of a registry serving tags, manifests and blobs"""
+
+    def log_message(self, format, *args):  # pylint:disable=W0622
+        pass
+
+    def reply(self, code, body=b"", headers=None):
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def reply_json(self, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        return self.reply(200, body, dict({"Content-Type": "application/json"}, **(headers or {})))  # noqa:E501
+
+    def do_HEAD(self):  # pylint:disable=C0103
+        self.do_GET()
+
+    def do_GET(self):  # pylint:disable=C0103
+        server = self.server
+        url = urlparse(self.path)
+        server.requests.append((self.command, url.path, self.headers.get("If-None-Match")))  # noqa:E501
+        if url.path == "/token":
+            return self.reply_json({"token": TOKEN})
+        if url.path == "/notoken":
+            return self.reply_json({})
+        if not url.path.startswith("/v2/") or url.path.count("/") < 4:
+            return self.reply(404)
+        repository, kind, reference = url.path[len("/v2/"):].rsplit("/", 2)
+        if repository in server.forbidden:
+            return self.reply(403)
+        if repository in server.protected and \
+                self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            realm = f"http://{self.headers['Host']}/token"
+            return self.reply(401, headers={"WWW-Authenticate": f'Bearer realm="{realm}",service="unittest",scope="repository:{repository}:pull"'})  # noqa:E501
+        if kind == "tags" and reference == "list" and repository in server.tags:  # noqa:E501
+            return self.reply_tags(server.tags[repository], parse_qs(url.query))  # noqa:E501
+        if kind == "manifests" and (repository, reference) in server.manifests:  # noqa:E501
+            body = server.manifests[(repository, reference)]
+            digest = f"sha256:{sha256(body).hexdigest()}"
+            return self.reply(200, body, {"Content-Type": json.loads(body)["mediaType"], "Docker-Content-Digest": digest})  # noqa:E501
+        if kind == "blobs" and (repository, reference) in server.blobs:
+            return self.reply(200)
+        return self.reply(404)
+
+    def reply_tags(self, names, query):
+        size = int(query.get("n", ["1000"])[0])
+        last = query.get("last", [None])[0]
+        start = names.index(last) + 1 if last is not None else 0
+        page = names[start:start + size]
+        etag = f'"{self.path}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self.reply(304)
+        headers = {"ETag": etag}
+        if start + size < len(names):
+            headers["Link"] = f'<{urlparse(self.path).path}?n={size}&last={page[-1]}>; rel="next"'  # noqa:E501
+        return self.reply_json({"tags": page}, headers)
+
+
+class FakeRegistry(ThreadingHTTPServer):
+    """Serve a FakeRegistryHandler on a free local port in a thread
+
+    tags: repository -> tag names
+    manifests: (repository, tag or digest) -> manifest body
+    blobs: (repository, digest) of existing blobs
+    protected: repositories that require a bearer token
+    forbidden: repositories that always answer 403
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRegistryHandler)
+        self.tags = {}
+        self.manifests = {}
+        self.blobs = set()
+        self.protected = set()
+        self.forbidden = set()
+        self.requests = []
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def host(self):
+        return f"127.0.0.1:{self.server_address[1]}"
+
+    def add_manifest(self, repository, reference, payload):
+        body = json.dumps(payload).encode("utf-8")
+        digest = f"sha256:{sha256(body).hexdigest()}"
+        self.manifests[(repository, reference)] = body
+        self.manifests[(repository, digest)] = body
+        return digest
+
+    def add_image(self, repository, reference, layers, platform=None):
+        payload = {"schemaVersion": 2, "mediaType": MANIFEST,
+                   "config": {"digest": digest_of("config:" + ",".join(name for name, _ in layers)), "size": 10},  # noqa:E501
+                   "layers": [{"digest": digest_of(name), "size": size} for name, size in layers]}  # noqa:E501
+        if platform is None:
+            return self.add_manifest(repository, reference, payload)
+        return self.add_manifest(repository, f"{reference}-{platform.replace('/', '-')}", payload)  # noqa:E501
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+# coding:utf-8
+
+import unittest
+from unittest import mock
+
+from ckits_images import client
+from ckits_images import planner
+from ckits_images import tags
+
+
+class TestUnifiedClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.digest = "sha256:a8560b36e8b8210634f77d9f7f9efd7ffa463e380b75e2e74aff4511df3ef88c"  # noqa:E501
+        cls.plan = planner.TransferPlan([
+            planner.TransferStep("demo:v1", "registry.example.com/library/demo:v1", digest=cls.digest),  # noqa:E501
+            planner.TransferStep("tool:v1", "registry.example.com/library/tool:v1", planner.TransferStep.SKIP),  # noqa:E501
+            planner.TransferStep("demo:v2", "registry.example.com/library/demo:v2"),  # noqa:E501
+            planner.TransferStep("demo:v3", "registry.example.com/library/demo:v3"),  # noqa:E501
+        ])
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.unified = client.UnifiedClient(self.client)
+
+    def tearDown(self):
+        self.unified.__exit__(None, None, None)
+
+    def test_pull_tags(self):
+        selected = tags.TagFilter(glob="v2.*").select("registry.example.com/unittest/demo", ["latest", "v1.0.0", "v2.0.0", "v2.1.0"])  # noqa:E501
+        self.assertEqual(len(self.unified.pull_tags(selected)), 2)
+        self.assertEqual(self.client.images.pull.call_args_list, [
+            mock.call("registry.example.com/unittest/demo:v2.0.0", all_tags=False),  # noqa:E501
+            mock.call("registry.example.com/unittest/demo:v2.1.0", all_tags=False)])  # noqa:E501
+
+    def test_execute(self):
+        self.client.images.get.return_value.tag.return_value = True
+        self.assertTrue(self.unified.execute(self.plan))
+        self.assertEqual(self.client.images.pull.call_args_list, [
+            mock.call(f"docker.io/library/demo@{self.digest}", all_tags=False),  # noqa:E501
+            mock.call("docker.io/library/demo:v2", all_tags=False),
+            mock.call("docker.io/library/demo:v3", all_tags=False)])
+        self.assertEqual(self.client.images.push.call_args_list, [
+            mock.call("registry.example.com/library/demo:v1"),
+            mock.call("registry.example.com/library/demo:v2"),
+            mock.call("registry.example.com/library/demo:v3")])
+
+    def test_execute_failed(self):
+        self.client.images.get.return_value.tag.side_effect = [True, False, True]  # noqa:E501
+        self.assertFalse(self.unified.execute(self.plan))
+        self.assertEqual(self.client.images.pull.call_count, 2)
+        self.assertEqual(self.client.images.push.call_args_list, [
+            mock.call("registry.example.com/library/demo:v1")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+# coding:utf-8
+
+import json
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from urllib.error import HTTPError
+
+from ckits_images import planner
+from ckits_images import registry
+from ckits_images import tags
+from ckits_images.unittest.fake_registry import INDEX
+from ckits_images.unittest.fake_registry import MANIFEST
+from ckits_images.unittest.fake_registry import FakeRegistry
+from ckits_images.unittest.fake_registry import digest_of
+
+
+class TestTransferPlanner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.src = FakeRegistry()
+        cls.dst = FakeRegistry()
+        # demo:v1 and demo:v2 share the base layer, v1 also tagged as stable
+        cls.src.add_image("upstream/demo", "v1", [("base", 1000), ("v1", 100)])  # noqa:E501
+        cls.src.add_image("upstream/demo", "stable", [("base", 1000), ("v1", 100)])  # noqa:E501
+        cls.src.add_image("upstream/demo", "v2", [("base", 1000), ("v2", 200)])  # noqa:E501
+        cls.src.add_image("upstream/tool", "v1", [("tool", 50)])
+        amd64 = cls.src.add_image("upstream/multi", "v1", [("multi-amd64", 300)], "linux/amd64")  # noqa:E501
+        arm64 = cls.src.add_image("upstream/multi", "v1", [("multi-arm64", 400)], "linux/arm64/v8")  # noqa:E501
+        cls.src.add_manifest("upstream/multi", "v1", {"schemaVersion": 2, "mediaType": INDEX, "manifests": [  # noqa:E501
+            {"mediaType": MANIFEST, "digest": arm64, "size": 1, "platform": {"os": "linux", "architecture": "arm64", "variant": "v8"}},  # noqa:E501
+            {"mediaType": MANIFEST, "digest": amd64, "size": 1, "platform": {"os": "linux", "architecture": "amd64"}}]})  # noqa:E501
+        cls.src.add_image("upstream/repeat", "v1", [("repeat-base", 500), ("repeat-copy", 20), ("repeat-copy", 20)])  # noqa:E501
+        cls.src.add_manifest("upstream/legacy", "v1", {"schemaVersion": 1, "mediaType": "application/json"})  # noqa:E501
+        # tool:v1 is already mirrored, the base layer is already present
+        cls.dst.add_image("mirror/tool", "v1", [("tool", 50)])
+        cls.dst.blobs.add(("mirror/demo", digest_of("base")))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.src.stop()
+        cls.dst.stop()
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.registry = registry.Registry(cache=registry.RegistryCache(self.tempdir.name), scheme="http")  # noqa:E501
+        self.planner = planner.TransferPlanner({f"{self.src.host}/upstream": f"{self.dst.host}/mirror"}, registry=self.registry, bandwidth=100)  # noqa:E501
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_destination_tags(self):
+        self.assertIsInstance(dst := self.planner.destination_tags(f"{self.src.host}/upstream/demo:v1"), tags.Tags)  # noqa:E501
+        self.assertEqual([tag.name for tag in dst], [f"{self.dst.host}/mirror/demo:v1"])  # noqa:E501
+        multi = planner.TransferPlanner({"docker.io": "registry.example.com", "docker.io/library/": ["a.example.com/library", "b.example.com/docker/"]}, registry=self.registry)  # noqa:E501
+        self.assertEqual([tag.name for tag in multi.destination_tags("alpine:3.20")], ["a.example.com/library/alpine:3.20", "b.example.com/docker/alpine:3.20"])  # noqa:E501
+        self.assertEqual([tag.name for tag in multi.destination_tags("unittest/demo")], ["registry.example.com/unittest/demo:latest"])  # noqa:E501
+        self.assertRaises(ValueError, multi.destination_tags, "quay.io/unittest/demo")  # noqa:E501
+        self.assertEqual([tag.name for tag in multi.destination_tags("libraryx/demo")], ["registry.example.com/libraryx/demo:latest"])  # noqa:E501
+
+    def test_destination_tags_digest(self):
+        digest = "sha256:a8560b36e8b8210634f77d9f7f9efd7ffa463e380b75e2e74aff4511df3ef88c"  # noqa:E501
+        mirror = planner.TransferPlanner({"docker.io": "registry.example.com"}, registry=self.registry)  # noqa:E501
+        self.assertRaises(ValueError, mirror.destination_tags, f"alpine@{digest}")  # noqa:E501
+        self.assertRaises(ValueError, mirror.plan, [f"alpine@{digest}"])
+
+    def test_destination_tags_invalid(self):
+        deeper = planner.TransferPlanner({"docker.io": "registry.example.com/mirror"}, registry=self.registry)  # noqa:E501
+        self.assertRaises(ValueError, deeper.destination_tags, "library/alpine:3")  # noqa:E501
+        shorter = planner.TransferPlanner({"docker.io/library/alpine": "registry.example.com"}, registry=self.registry)  # noqa:E501
+        self.assertRaises(ValueError, shorter.destination_tags, "library/alpine:3")  # noqa:E501
+
+    def test_resolve(self):
+        self.assertIsInstance(image := self.planner.resolve(f"{self.src.host}/upstream/demo:v1"), planner.Image)  # noqa:E501
+        self.assertEqual(image.size, 1110)
+        self.assertEqual(image.digests, (image.digest,))
+        self.assertIs(self.planner.resolve(f"{self.src.host}/upstream/demo:v1"), image)  # noqa:E501
+        self.assertIsInstance(multi := self.planner.resolve(f"{self.src.host}/upstream/multi:v1"), planner.Image)  # noqa:E501
+        self.assertEqual(multi.size, 310)
+        self.assertIsNotNone(multi.index_digest)
+        self.assertEqual(len(multi.digests), 2)
+        arm64 = planner.TransferPlanner({}, registry=self.registry, platform="linux/arm64")  # noqa:E501
+        self.assertEqual(arm64.platform, "linux/arm64")
+        self.assertEqual(arm64.resolve(f"{self.src.host}/upstream/multi:v1").size, 410)  # noqa:E501
+        s390x = planner.TransferPlanner({}, registry=self.registry, platform="linux/s390x")  # noqa:E501
+        self.assertRaises(ValueError, s390x.resolve, f"{self.src.host}/upstream/multi:v1")  # noqa:E501
+        self.assertRaises(ValueError, self.planner.resolve, f"{self.src.host}/upstream/legacy:v1")  # noqa:E501
+        self.assertRaises(HTTPError, self.planner.resolve, f"{self.src.host}/upstream/missing:v1")  # noqa:E501
+
+    def test_plan(self):
+        src = tags.Tags()
+        src.extend([f"{self.src.host}/upstream/tool:v1",
+                    f"{self.src.host}/upstream/demo:v2",
+                    f"{self.src.host}/upstream/multi:v1",
+                    f"{self.src.host}/upstream/demo:v1,stable"])
+        self.dst.requests.clear()
+        self.assertIsInstance(plan := self.planner.plan(src), planner.TransferPlan)  # noqa:E501
+        self.assertEqual([(step.src.image, step.action) for step in plan], [
+            ("demo:v2", "transport"), ("demo:v1", "transport"),
+            ("demo:stable", "transport"), ("multi:v1", "transport"),
+            ("tool:v1", "skip")])
+        v2, v1, stable, multi, tool = plan.steps
+        self.assertEqual(v2.pull_bytes, 1210)
+        self.assertEqual(v2.push_bytes, 210)  # base layer already present
+        self.assertEqual(v1.pull_bytes, 110)
+        self.assertEqual(v1.push_bytes, 110)
+        self.assertEqual(stable.pull_bytes, 0)
+        self.assertEqual(stable.push_bytes, 0)
+        self.assertEqual(stable.dst.name, f"{self.dst.host}/mirror/demo:stable")  # noqa:E501
+        self.assertEqual(multi.transfer_bytes, 620)
+        self.assertEqual(tool.transfer_bytes, 0)
+        self.assertEqual(len(plan.transports), 4)
+        self.assertEqual(plan.pull_bytes, 1630)
+        self.assertEqual(plan.push_bytes, 630)
+        self.assertEqual(plan.transfer_bytes, 2260)
+        self.assertAlmostEqual(plan.estimated_seconds, 22.6)
+        # nothing is pulled, only manifests and blob existence are checked
+        self.assertTrue(all(method == "HEAD" for method, _, _ in self.dst.requests))  # noqa:E501
+
+    def test_plan_repeated_layer(self):
+        self.assertEqual(self.planner.resolve(f"{self.src.host}/upstream/repeat:v1").size, 530)  # noqa:E501
+        self.dst.requests.clear()
+        plan = self.planner.plan([f"{self.src.host}/upstream/repeat:v1"])
+        self.assertEqual(plan.pull_bytes, 530)
+        self.assertEqual(plan.push_bytes, 530)
+        self.assertEqual(plan.steps[0].push_blobs.count(digest_of("repeat-copy")), 1)  # noqa:E501
+        blob_requests = [path for _, path, _ in self.dst.requests if "/blobs/" in path]  # noqa:E501
+        self.assertEqual(len(blob_requests), len(set(blob_requests)))
+        self.assertEqual(len(blob_requests), 3)
+
+    def test_plan_cached(self):
+        sources = [f"{self.src.host}/upstream/demo:v1", f"{self.src.host}/upstream/multi:v1"]  # noqa:E501
+        self.src.requests.clear()
+        plan = self.planner.plan(sources)
+        # tags are resolved with HEAD, only manifests by digest are pulled
+        self.assertEqual([method for method, path, _ in self.src.requests if path.endswith((":v1", "/v1"))], ["HEAD", "HEAD"])  # noqa:E501
+        self.assertTrue(all("/manifests/sha256:" in path for method, path, _ in self.src.requests if method == "GET"))  # noqa:E501
+        self.src.requests.clear()
+        again = planner.TransferPlanner({f"{self.src.host}/upstream": f"{self.dst.host}/mirror"}, registry=self.registry, bandwidth=100)  # noqa:E501
+        self.assertEqual(again.plan(sources).dump(), plan.dump())
+        self.assertEqual([method for method, _, _ in self.src.requests], ["HEAD", "HEAD"])  # noqa:E501
+
+    def test_plan_file(self):
+        plan = self.planner.plan([f"{self.src.host}/upstream/demo:v1,stable", f"{self.src.host}/upstream/tool:v1"])  # noqa:E501
+        filename = os.path.join(self.tempdir.name, "plan.json")
+        plan.save(filename)
+        with open(filename, "r", encoding="utf-8") as rhdl:
+            data = json.load(rhdl)
+        self.assertEqual(data["version"], planner.TransferPlan.VERSION)
+        self.assertEqual(data["estimated_seconds"], plan.estimated_seconds)
+        self.assertEqual(data["steps"][0]["estimated_seconds"], plan.estimate(plan.steps[0].transfer_bytes))  # noqa:E501
+        self.assertIsInstance(loaded := planner.TransferPlan.open(filename), planner.TransferPlan)  # noqa:E501
+        self.assertEqual(len(loaded), len(plan))
+        self.assertEqual(loaded.bandwidth, plan.bandwidth)
+        self.assertEqual(loaded.dump(), plan.dump())
+        for step in loaded:
+            self.assertIsInstance(step, planner.TransferStep)
+        self.assertRaises(FileNotFoundError, planner.TransferPlan.open, self.tempdir.name)  # noqa:E501
+        self.assertRaises(ValueError, planner.TransferPlan.load, {"version": 0, "steps": []})  # noqa:E501
+
+    def test_step(self):
+        self.assertRaises(ValueError, planner.TransferStep, "demo", "registry.example.com/demo", "copy")  # noqa:E501
+        step = planner.TransferStep.load({"src": "demo", "dst": "registry.example.com/demo"})  # noqa:E501
+        self.assertEqual(step.action, planner.TransferStep.TRANSPORT)
+        self.assertIsNone(step.digest)
+        self.assertEqual(step.transfer_bytes, 0)
+        self.assertEqual(planner.TransferPlan([step]).estimated_seconds, 0.0)  # noqa:E501
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+# coding:utf-8
+
+import json
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from urllib.error import HTTPError
+
+from ckits_images import registry
+from ckits_images import tags
+from ckits_images.unittest.fake_registry import TOKEN
+from ckits_images.unittest.fake_registry import FakeRegistry
+from ckits_images.unittest.fake_registry import digest_of
+
+TAGS = ["latest", "v1.0.0", "v1.9.3", "v2.0.0", "v2.1.0",
+        "v2.2.0-rc.1", "v2.10.4", "v3.0.0", "v2.1-alpine"]
+
+
+class TestRegistry(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRegistry()
+        cls.server.tags["unittest/demo"] = TAGS
+        cls.server.tags["private/demo"] = TAGS
+        cls.server.protected.add("private/demo")
+        cls.server.forbidden.add("unittest/forbidden")
+        cls.server.add_image("unittest/demo", "v1.0.0", [("base", 1000)])
+        cls.server.add_image("private/demo", "v1.0.0", [("base", 1000)])
+        cls.server.blobs.add(("private/demo", digest_of("base")))
+        cls.host = cls.server.host
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.cache = registry.RegistryCache(self.tempdir.name)
+        self.registry = registry.Registry(cache=self.cache, scheme="http", page_size=4)  # noqa:E501
+        self.server.requests.clear()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_endpoint(self):
+        self.assertEqual(registry.Registry(cache=self.cache).endpoint("demo"), f"https://{registry.Registry.DOCKER_HUB_HOST}")  # noqa:E501
+        self.assertEqual(self.registry.tags_url(f"{self.host}/unittest/demo"), f"http://{self.host}/v2/unittest/demo/tags/list?n=4")  # noqa:E501
+
+    def test_default_cache(self):
+        self.assertTrue(registry.RegistryCache().directory.endswith(os.path.join("ckits", "registry")))  # noqa:E501
+        self.assertIsInstance(registry.Registry().cache, registry.RegistryCache)  # noqa:E501
+
+    def test_list_tags(self):
+        self.assertEqual(self.registry.list_tags(f"{self.host}/unittest/demo"), TAGS)  # noqa:E501
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertTrue(all(etag is None for _, _, etag in self.server.requests))  # noqa:E501
+
+    def test_list_tags_revalidate(self):
+        self.assertEqual(self.registry.list_tags(f"{self.host}/unittest/demo"), TAGS)  # noqa:E501
+        self.server.requests.clear()
+        other = registry.Registry(cache=self.cache, scheme="http", page_size=4)  # noqa:E501
+        self.assertEqual(other.list_tags(f"{self.host}/unittest/demo"), TAGS)  # noqa:E501
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertTrue(all(etag is not None for _, _, etag in self.server.requests))  # noqa:E501
+
+    def test_list_tags_token(self):
+        self.assertEqual(self.registry.list_tags(f"{self.host}/private/demo"), TAGS)  # noqa:E501
+        paths = [path for _, path, _ in self.server.requests]
+        self.assertEqual(paths.count("/token"), 1)
+
+    def test_list_tags_not_found(self):
+        self.assertRaises(HTTPError, self.registry.list_tags, f"{self.host}/unittest/missing")  # noqa:E501
+
+    def test_manifest(self):
+        self.assertIsInstance(manifest := self.registry.manifest(f"{self.host}/unittest/demo:v1.0.0"), tuple)  # noqa:E501
+        payload, digest = manifest
+        self.assertEqual(payload["layers"][0]["digest"], digest_of("base"))
+        self.assertEqual(self.registry.manifest_digest(f"{self.host}/unittest/demo:v1.0.0"), digest)  # noqa:E501
+        self.assertTrue(self.registry.blob_exists(f"{self.host}/private/demo", digest_of("base")))  # noqa:E501
+
+    def test_manifest_cached(self):
+        _, digest = self.registry.manifest(f"{self.host}/unittest/demo:v1.0.0")  # noqa:E501
+        self.assertEqual([(method, path) for method, path, _ in self.server.requests], [  # noqa:E501
+            ("HEAD", "/v2/unittest/demo/manifests/v1.0.0"),
+            ("GET", f"/v2/unittest/demo/manifests/{digest}")])
+        self.server.requests.clear()
+        self.assertEqual(self.registry.manifest(f"{self.host}/unittest/demo:v1.0.0")[1], digest)  # noqa:E501
+        self.assertEqual(self.registry.manifest(f"{self.host}/unittest/demo@{digest}")[1], digest)  # noqa:E501
+        self.assertEqual([(method, path) for method, path, _ in self.server.requests], [  # noqa:E501
+            ("HEAD", "/v2/unittest/demo/manifests/v1.0.0")])
+
+    def test_head_not_found(self):
+        self.assertIsNone(self.registry.manifest_digest(f"{self.host}/unittest/demo:v9"))  # noqa:E501
+        self.assertFalse(self.registry.blob_exists(f"{self.host}/unittest/demo", digest_of("base")))  # noqa:E501
+        self.assertEqual([method for method, _, _ in self.server.requests], ["HEAD", "HEAD"])  # noqa:E501
+
+    def test_head_token(self):
+        self.assertIsNotNone(self.registry.manifest_digest(f"{self.host}/private/demo:v1.0.0"))  # noqa:E501
+        self.assertEqual([(method, path) for method, path, _ in self.server.requests], [  # noqa:E501
+            ("HEAD", "/v2/private/demo/manifests/v1.0.0"), ("GET", "/token"),
+            ("HEAD", "/v2/private/demo/manifests/v1.0.0")])
+        self.assertIsNone(self.registry.manifest_digest(f"{self.host}/private/demo:v9"))  # noqa:E501
+
+    def test_head_error(self):
+        self.assertRaises(HTTPError, self.registry.manifest_digest, f"{self.host}/unittest/forbidden")  # noqa:E501
+        self.assertRaises(HTTPError, self.registry.blob_exists, f"{self.host}/unittest/forbidden", digest_of("base"))  # noqa:E501
+
+    def test_select_tags(self):
+        self.assertIsInstance(selected := self.registry.select_tags(f"{self.host}/unittest/demo", glob="v2.*"), tags.Tags)  # noqa:E501
+        self.assertEqual([tag.tag for tag in selected], ["v2.0.0", "v2.1.0", "v2.2.0-rc.1", "v2.10.4", "v2.1-alpine"])  # noqa:E501
+        for tag in selected:
+            self.assertEqual(tag.registry_host, self.host)
+            self.assertEqual(tag.namespace, "unittest")
+            self.assertEqual(tag.repository, "demo")
+        selected = self.registry.select_tags(f"{self.host}/unittest/demo", semver="^2.1")  # noqa:E501
+        self.assertEqual([tag.tag for tag in selected], ["v2.1.0", "v2.10.4"])  # noqa:E501
+        selected = self.registry.select_tags(f"{self.host}/unittest/demo", regex=r"v1\.\d+\.\d+")  # noqa:E501
+        self.assertEqual([tag.tag for tag in selected], ["v1.0.0", "v1.9.3"])  # noqa:E501
+
+    def test_cache(self):
+        url = f"http://{self.host}/v2/unittest/demo/tags/list"
+        self.assertIsNone(self.cache.load(url))
+        self.assertEqual(self.cache.validators(None), {})
+        with open(self.cache.filename(url), "w", encoding="utf-8") as whdl:
+            whdl.write("{")
+        self.assertIsNone(self.cache.load(url))
+        with open(self.cache.filename(url), "w", encoding="utf-8") as whdl:
+            json.dump({"url": "other", "etag": None, "last_modified": "now"}, whdl)  # noqa:E501
+        self.assertIsNone(self.cache.load(url))
+        self.assertEqual(self.cache.validators({"last_modified": "now"}), {"If-Modified-Since": "now"})  # noqa:E501
+
+    def test_token(self):
+        self.assertRaises(ValueError, self.registry.token, 'Bearer service="unittest"')  # noqa:E501
+        self.assertRaises(ValueError, self.registry.token, f'Bearer realm="http://{self.host}/notoken"')  # noqa:E501
+        self.assertEqual(self.registry.token(f'Bearer realm="http://{self.host}/token"'), TOKEN)  # noqa:E501
+
+    def test_next_url(self):
+        url = f"http://{self.host}/v2/unittest/demo/tags/list?n=4"
+        self.assertIsNone(registry.Registry.next_url(url, None))
+        self.assertIsNone(registry.Registry.next_url(url, '<http://other>; rel="prev"'))  # noqa:E501
+        self.assertEqual(registry.Registry.next_url(url, '</v2/unittest/demo/tags/list?n=4&last=v2.0.0>; rel="next"'), f"http://{self.host}/v2/unittest/demo/tags/list?n=4&last=v2.0.0")  # noqa:E501
+        self.assertEqual(registry.Registry.scope("http://other"), "http://other")  # noqa:E501
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+# coding:utf-8
+
+import unittest
+
+from ckits_images import semver
+
+
+class TestVersion(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_parse(self):
+        self.assertIsInstance(version := semver.Version.parse("v2.1.3-rc.1+build.5"), semver.Version)  # noqa:E501
+        self.assertEqual(version.major, 2)
+        self.assertEqual(version.minor, 1)
+        self.assertEqual(version.patch, 3)
+        self.assertEqual(version.prerelease, "rc.1")
+        self.assertEqual(str(version), "2.1.3-rc.1")
+        self.assertEqual(str(semver.Version.parse("2")), "2.0.0")
+        self.assertRaises(ValueError, semver.Version.parse, "latest")
+        self.assertIsNone(semver.Version.try_parse("2.1.3.4"))
+
+    def test_compare(self):
+        self.assertEqual(semver.Version.parse("v2.1"), semver.Version(2, 1))
+        self.assertNotEqual(semver.Version(2, 1), "2.1.0")
+        self.assertLess(semver.Version.parse("2.1.0-rc.1"), semver.Version.parse("2.1.0"))  # noqa:E501
+        self.assertLess(semver.Version.parse("2.1.0-rc.2"), semver.Version.parse("2.1.0-rc.10"))  # noqa:E501
+        self.assertLess(semver.Version.parse("2.1.0-10"), semver.Version.parse("2.1.0-alpha"))  # noqa:E501
+        self.assertLessEqual(semver.Version(2, 1), semver.Version(2, 1))
+        self.assertGreater(semver.Version(2, 10), semver.Version(2, 9, 9))
+        self.assertGreaterEqual(semver.Version(3), semver.Version(2, 9, 9))
+        self.assertEqual(len({semver.Version(2), semver.Version.parse("v2.0.0")}), 1)  # noqa:E501
+
+
+class TestVersionRange(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def assertMatch(self, text, included, excluded, include_prerelease=False):  # noqa:E501 pylint:disable=C0103
+        version_range = semver.VersionRange(text, include_prerelease)
+        for version in included:
+            self.assertIn(version, version_range, f"{version} not in {text}")  # noqa:E501
+        for version in excluded:
+            self.assertNotIn(version, version_range, f"{version} in {text}")  # noqa:E501
+
+    def test_comparators(self):
+        self.assertMatch(">=2.1, <3", ["2.1.0", "v2.9.9"], ["2.0.9", "3.0.0"])  # noqa:E501
+        self.assertMatch(">= 2.1 <= 2.2", ["2.1.0", "2.2.9"], ["2.3.0"])
+        self.assertMatch(">=2.1.0 <=2.2.0", ["2.2.0"], ["2.2.1"])
+        self.assertMatch(">2.1", ["2.2.0"], ["2.1.9"])
+        self.assertMatch(">2", ["3.0.0"], ["2.9.9"])
+        self.assertMatch(">2.1.0", ["2.1.1"], ["2.1.0"])
+        self.assertMatch("<=2", ["2.9.9"], ["3.0.0"])
+        self.assertMatch("!=2.1.0", ["2.1.1"], ["2.1.0"])
+        self.assertMatch("==2.1.0", ["2.1.0"], ["2.1.1"])
+
+    def test_partial(self):
+        self.assertMatch("2", ["2.0.0", "2.9.9"], ["3.0.0", "1.9.9"])
+        self.assertMatch("2.x", ["2.0.0", "2.9.9"], ["3.0.0"])
+        self.assertMatch("2.*.*", ["2.0.0", "2.9.9"], ["3.0.0"])
+        self.assertMatch("x.x", ["0.0.1", "9.9.9"], ["latest"])
+        self.assertMatch("=2.1.*", ["2.1.0", "2.1.9"], ["2.2.0"])
+        self.assertMatch("2.1.3", ["2.1.3"], ["2.1.4"])
+        self.assertMatch("*", ["0.0.1", "9.9.9"], ["latest", "2.0.0-rc.1"])
+
+    def test_caret_tilde(self):
+        self.assertMatch("^2.1", ["2.1.0", "2.10.0"], ["2.0.9", "3.0.0"])
+        self.assertMatch("^0.2.3", ["0.2.3", "0.2.9"], ["0.3.0"])
+        self.assertMatch("^0.0.3", ["0.0.3"], ["0.0.4"])
+        self.assertMatch("~2.1.3", ["2.1.3", "2.1.9"], ["2.2.0"])
+        self.assertMatch("~2", ["2.9.9"], ["3.0.0"])
+
+    def test_alternatives(self):
+        self.assertMatch("^1.2 || ^3", ["1.9.0", "3.1.0"], ["2.0.0"])
+
+    def test_prerelease(self):
+        self.assertMatch("^2", [], ["2.1.0-rc.1", "2.1-alpine"])
+        self.assertMatch("^2", ["2.1.0-rc.1"], ["3.0.0-rc.1"], include_prerelease=True)  # noqa:E501
+        self.assertMatch("2.1.0-rc.1", ["2.1.0-rc.1"], ["2.1.0-rc.2"], include_prerelease=True)  # noqa:E501
+        self.assertMatch("^2.1.0-rc.1", ["2.1.0-rc.2", "2.9.0"], ["2.1.0-beta", "3.0.0"], include_prerelease=True)  # noqa:E501
+        self.assertMatch("<2.1.0-rc.2", ["2.1.0-rc.1", "2.0.0"], ["2.1.0-rc.2", "2.1.0"], include_prerelease=True)  # noqa:E501
+        self.assertMatch(">=2.1.0-rc.1", ["2.1.0-rc.2", "2.1.0"], ["2.1.0-beta"], include_prerelease=True)  # noqa:E501
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, semver.VersionRange, "")
+        self.assertRaises(ValueError, semver.VersionRange, ">=")
+        self.assertRaises(ValueError, semver.VersionRange, "latest")
+        self.assertRaises(ValueError, semver.VersionRange, "1.2.3.4")
+        self.assertRaises(ValueError, semver.VersionRange, "x.1")
+        self.assertRaises(ValueError, semver.VersionRange, "2.*.3")
+        self.assertRaises(ValueError, semver.VersionRange, "!=2.1")
+        self.assertRaises(ValueError, semver.VersionRange, "!=2.x")
+        self.assertRaises(ValueError, semver.VersionRange, "!=*")
+
+    def test_magic(self):
+        version_range = semver.VersionRange("^2.1")
+        self.assertEqual(str(version_range), "^2.1")
+        self.assertEqual(version_range.text, "^2.1")
+        self.assertFalse(version_range.include_prerelease)
+        self.assertTrue(version_range.match(semver.Version(2, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -207,6 +207,39 @@ class TestTags(unittest.TestCase):
             self.assertEqual(tag.repository, "demo")
 
 
+class TestTagFilter(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.names = ["latest", "v1.0.0", "v2.0.0", "v2.1.0", "v2.1.0-rc.1", "v2.1-alpine"]  # noqa:E501
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_match(self):
+        self.assertTrue(tags.TagFilter()("latest"))
+        self.assertIsInstance(tag_filter := tags.TagFilter(glob="v2.*", regex=r"v\d+\.\d+\.\d+.*", semver=">=2.1"), tags.TagFilter)  # noqa:E501
+        self.assertEqual(tag_filter.glob, "v2.*")
+        self.assertIsNotNone(tag_filter.regex)
+        self.assertIsNotNone(tag_filter.semver)
+        self.assertEqual([name for name in self.names if tag_filter(name)], ["v2.1.0"])  # noqa:E501
+        self.assertEqual([name for name in self.names if tags.TagFilter(regex="v2")(name)], [])  # noqa:E501
+        self.assertEqual([name for name in self.names if tags.TagFilter(semver="^2", include_prerelease=True)(name)], ["v2.0.0", "v2.1.0", "v2.1.0-rc.1", "v2.1-alpine"])  # noqa:E501
+
+    def test_select(self):
+        self.assertIsInstance(selected := tags.TagFilter(glob="v2.*").select("registry.example.com/unittest/demo:latest", self.names), tags.Tags)  # noqa:E501
+        self.assertEqual(len(selected), 4)
+        self.assertIn("registry.example.com/unittest/demo:v2.1-alpine", selected)  # noqa:E501
+        self.assertNotIn("registry.example.com/unittest/demo:latest", selected)  # noqa:E501
+
+
 class TestTagConfigFile(unittest.TestCase):
 
     @classmethod